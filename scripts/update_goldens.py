@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import cv2
+
+from sketch2cad import _jsonio
 from sketch2cad.models import PipelineConfig
 from sketch2cad.pipeline import run_pipeline
 from sketch2cad.metrics import compute_dxf_metrics
@@ -24,6 +28,46 @@ def _apply_preprocess_overrides(cfg: PipelineConfig, meta: dict) -> PipelineConf
     return cfg
 
 
+def _init_worker() -> None:
+    # Fixtures already run in parallel; keep OpenCV from oversubscribing the cores
+    cv2.setNumThreads(1)
+
+
+def _process_fixture(fdir: Path) -> tuple[str, bool, list[str]]:
+    """
+    Regenerate one fixture. Returns (name, ok, lines to print).
+    """
+    meta_path = fdir / "meta.json"
+    input_path = fdir / "input.png"
+    if not meta_path.exists() or not input_path.exists():
+        return fdir.name, True, [f"Skipping {fdir.name}: missing meta.json or input.png"]
+
+    meta = _jsonio.loads(meta_path.read_bytes())
+    ref_mm = float(meta.get("ref_mm"))
+    ref_px = float(meta.get("ref_px"))
+
+    out_dxf = fdir / "golden_out.dxf"
+    debug_dir = fdir / "_debug"
+
+    cfg = PipelineConfig(
+        input_path=str(input_path),
+        output_dxf=str(out_dxf),
+        ref_mm=ref_mm,
+        ref_px=ref_px,
+        debug_dump=True,
+        debug_dir=str(debug_dir),
+    )
+    cfg = _apply_preprocess_overrides(cfg, meta)
+
+    rep = run_pipeline(cfg)
+    if rep.status != "ok":
+        return fdir.name, False, [f"❌ {fdir.name}: pipeline failed", *rep.errors]
+
+    metrics = compute_dxf_metrics(str(out_dxf))
+    (fdir / "golden_metrics.json").write_bytes(_jsonio.dumps(metrics.to_dict()))
+    return fdir.name, True, [f"✅ {fdir.name}: wrote golden_metrics.json"]
+
+
 def main() -> int:
     if not FIXTURES_DIR.exists():
         print(f"Fixtures dir not found: {FIXTURES_DIR}")
@@ -36,48 +80,16 @@ def main() -> int:
 
     failed = 0
 
-    for fdir in sorted(fixture_dirs):
-        meta_path = fdir / "meta.json"
-        input_path = fdir / "input.png"
-        if not meta_path.exists() or not input_path.exists():
-            print(f"Skipping {fdir.name}: missing meta.json or input.png")
-            continue
-
-        meta = json.loads(meta_path.read_text(encoding="utf-8"))
-        ref_mm = float(meta.get("ref_mm"))
-        ref_px = float(meta.get("ref_px"))
-
-        out_dxf = fdir / "golden_out.dxf"
-        debug_dir = fdir / "_debug"
-
-        cfg = PipelineConfig(
-            input_path=str(input_path),
-            output_dxf=str(out_dxf),
-            ref_mm=ref_mm,
-            ref_px=ref_px,
-            debug_dump=True,
-            debug_dir=str(debug_dir),
-        )
-        cfg = _apply_preprocess_overrides(cfg, meta)
-
-        rep = run_pipeline(cfg)
-        if rep.status != "ok":
-            failed += 1
-            print(f"❌ {fdir.name}: pipeline failed")
-            for e in rep.errors:
-                print(e)
-            continue
-
-        metrics = compute_dxf_metrics(str(out_dxf))
-        (fdir / "golden_metrics.json").write_text(
-            json.dumps(metrics.to_dict(), indent=2),
-            encoding="utf-8",
-        )
-        print(f"✅ {fdir.name}: wrote golden_metrics.json")
+    # Fixtures are independent; run them in worker processes (ex.map keeps the order)
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker) as ex:
+        for _name, ok, lines in ex.map(_process_fixture, sorted(fixture_dirs)):
+            if not ok:
+                failed += 1
+            for line in lines:
+                print(line)
 
     return 1 if failed else 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
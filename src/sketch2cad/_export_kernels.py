@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from ._numba import jit
+from .models import PathSegment
+
+KIND_LINE = 0
+KIND_CUBIC = 1
+KIND_QUAD = 2
+
+
+def _sample_path(
+    kinds: np.ndarray,
+    pts_flat: np.ndarray,
+    offsets: np.ndarray,
+    samples: int,
+    scale: float,
+    eps: float,
+) -> np.ndarray:
+    """
+    Single pass over all segments of a path: sample Beziers, drop the first point
+    of a segment when it repeats the previous segment's last point, and scale.
+    Segment i owns pts_flat[offsets[i]:offsets[i + 1]]. Requires samples >= 1.
+    """
+    n_seg = kinds.shape[0]
+    size = 0
+    for s in range(n_seg):
+        size += 2 if kinds[s] == KIND_LINE else samples + 1
+
+    out = np.empty((size, 2), dtype=np.float64)
+    n = 0
+    px = 0.0
+    py = 0.0
+
+    for s in range(n_seg):
+        i0 = offsets[s]
+        i1 = offsets[s + 1]
+        kind = kinds[s]
+        count = 2 if kind == KIND_LINE else samples + 1
+
+        for j in range(count):
+            if kind == KIND_CUBIC:
+                t = j / samples
+                mt = 1.0 - t
+                b0 = mt * mt * mt
+                b1 = 3.0 * mt * mt * t
+                b2 = 3.0 * mt * t * t
+                b3 = t * t * t
+                x = (
+                    b0 * pts_flat[i0, 0]
+                    + b1 * pts_flat[i0 + 1, 0]
+                    + b2 * pts_flat[i0 + 2, 0]
+                    + b3 * pts_flat[i0 + 3, 0]
+                )
+                y = (
+                    b0 * pts_flat[i0, 1]
+                    + b1 * pts_flat[i0 + 1, 1]
+                    + b2 * pts_flat[i0 + 2, 1]
+                    + b3 * pts_flat[i0 + 3, 1]
+                )
+            elif kind == KIND_QUAD:
+                t = j / samples
+                mt = 1.0 - t
+                b0 = mt * mt
+                b1 = 2.0 * mt * t
+                b2 = t * t
+                x = b0 * pts_flat[i0, 0] + b1 * pts_flat[i0 + 1, 0] + b2 * pts_flat[i0 + 2, 0]
+                y = b0 * pts_flat[i0, 1] + b1 * pts_flat[i0 + 1, 1] + b2 * pts_flat[i0 + 2, 1]
+            else:
+                k = i0 if j == 0 else i1 - 1
+                x = pts_flat[k, 0]
+                y = pts_flat[k, 1]
+
+            # Avoid duplicating boundary points between segments
+            if j == 0 and n > 0 and abs(x - px) <= eps and abs(y - py) <= eps:
+                continue
+
+            out[n, 0] = x * scale
+            out[n, 1] = y * scale
+            px = x
+            py = y
+            n += 1
+
+    return out[:n]
+
+
+sample_path = jit(_sample_path)
+
+
+def flatten_segments(segments: Sequence[PathSegment]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten segments into (kinds, pts_flat, offsets) arrays for sample_path.
+    Segments that are not well-formed Beziers fall back to a line between their end points.
+    """
+    kinds = np.empty(len(segments), dtype=np.int8)
+    offsets = np.empty(len(segments) + 1, dtype=np.intp)
+
+    offsets[0] = 0
+    for i, seg in enumerate(segments):
+        n = len(seg.pts)
+        if seg.kind == "cubic_bezier" and n == 4:
+            kinds[i] = KIND_CUBIC
+        elif seg.kind == "quad_bezier" and n == 3:
+            kinds[i] = KIND_QUAD
+        else:
+            # sample_path only reads the first and last point of a line
+            kinds[i] = KIND_LINE
+        offsets[i + 1] = offsets[i] + n
+
+    pts_flat = np.concatenate([seg.pts for seg in segments]) if segments else np.empty((0, 2))
+    return kinds, pts_flat, offsets
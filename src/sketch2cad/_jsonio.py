@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    # Optional: pip install -e ".[fast]"
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes, indented by 2 spaces.
+
+    The two backends parse back to the same values, but the text can differ:
+    orjson writes exponents as 1e16 / 1e-7 (json: 1e+16 / 1e-07), turns NaN and
+    Infinity into null (json writes the non-standard NaN / Infinity), and rejects
+    integers wider than 64 bits. Non-ASCII text is written as-is by both.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Parse JSON from bytes (no intermediate str decode with orjson) or str.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
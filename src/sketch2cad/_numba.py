@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+try:
+    # Optional: pip install -e ".[fast]"
+    from numba import njit
+except ImportError:
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+
+def jit(fn: Callable, fallback: Callable | None = None) -> Callable:
+    """
+    Compile a loop kernel with numba when it is installed. Without numba, return
+    `fallback` (a vectorized NumPy equivalent) or, if none is given, `fn` itself.
+    """
+    if HAVE_NUMBA:
+        return njit(cache=True, fastmath=True)(fn)
+    return fn if fallback is None else fallback
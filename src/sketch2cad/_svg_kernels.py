@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ._numba import jit
+
+
+def _apply_affine(
+    pts: np.ndarray, a: float, b: float, c: float, d: float, e: float, f: float
+) -> np.ndarray:
+    """
+    Single pass over (N, 2) points: x' = a*x + c*y + e, y' = b*x + d*y + f.
+    """
+    out = np.empty((pts.shape[0], 2), dtype=np.float64)
+    for i in range(pts.shape[0]):
+        x = pts[i, 0]
+        y = pts[i, 1]
+        out[i, 0] = a * x + c * y + e
+        out[i, 1] = b * x + d * y + f
+    return out
+
+
+def _apply_affine_numpy(
+    pts: np.ndarray, a: float, b: float, c: float, d: float, e: float, f: float
+) -> np.ndarray:
+    out = pts @ np.array([[a, b], [c, d]])
+    out += (e, f)
+    return out
+
+
+apply_affine = jit(_apply_affine, fallback=_apply_affine_numpy)
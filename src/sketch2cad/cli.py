@@ -32,6 +32,7 @@ def run(
     morph_iters: int = typer.Option(1, help="Morphology iterations"),
     no_contours_filter: bool = typer.Option(False, help="Disable contour filtering"),
     debug: bool = typer.Option(False, help="Dump debug artifacts"),
+    debug_level: int = typer.Option(0, help="Debug artifacts: 0=off, 1=binary only, 2=all (--debug)"),
     debug_dir: str = typer.Option("./examples/output/_debug", help="Debug output dir"),
 ):
     cfg = PipelineConfig(
@@ -46,6 +47,7 @@ def run(
         morph_iters=morph_iters,
         use_contours_filter=not no_contours_filter,
         debug_dump=debug,
+        debug_level=debug_level,
         debug_dir=debug_dir,
     )
 
@@ -68,19 +70,21 @@ def watch_cmd(
     output_dir: str = typer.Argument(None, help="Output directory (default: env SKETCH2CAD_OUTPUT_DIR)"),
     stable_checks: int = typer.Option(None, help="Number of stable-size checks"),
     stable_interval_ms: int = typer.Option(None, help="Interval between checks (ms)"),
+    workers: int = typer.Option(None, help="Files processed in parallel (default: CPU count)"),
 ):
     in_dir = input_dir or os.getenv("SKETCH2CAD_INPUT_DIR", "./examples/input")
     out_dir = output_dir or os.getenv("SKETCH2CAD_OUTPUT_DIR", "./examples/output")
 
     sc = stable_checks if stable_checks is not None else int(os.getenv("SKETCH2CAD_STABLE_CHECKS", "3"))
     si = stable_interval_ms if stable_interval_ms is not None else int(os.getenv("SKETCH2CAD_STABLE_INTERVAL_MS", "250"))
+    nw = workers if workers is not None else int(os.getenv("SKETCH2CAD_WORKERS", "0"))
 
     Path(in_dir).mkdir(parents=True, exist_ok=True)
     Path(out_dir).mkdir(parents=True, exist_ok=True)
 
     typer.echo(f"👀 Watching: {in_dir} -> {out_dir}")
     typer.echo("   (Ctrl+C to stop)")
-    watch(in_dir, out_dir, stable_checks=sc, stable_interval_ms=si)
+    watch(in_dir, out_dir, stable_checks=sc, stable_interval_ms=si, workers=nw or None)
 
 
 # "watch" command name in CLI
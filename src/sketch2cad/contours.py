@@ -6,31 +6,39 @@ import numpy as np
 
 def filter_contours(binary: np.ndarray, min_area: int = 50) -> np.ndarray:
     """
-    Removes small artifacts using contour area thresholding.
+    Removes small artifacts using area thresholding on 8-connected components.
+    Area is the component's pixel count; all components are labelled in a single
+    pass and the kept ones are selected with a lookup table.
     Returns a cleaned binary image (ink=255).
+    With min_area <= 0 nothing can be removed and the input is returned as a copy.
     """
-    contours, _hier = cv2.findContours(binary, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
-    cleaned = np.zeros_like(binary)
+    if min_area <= 0:
+        return binary.copy()
 
-    for c in contours:
-        area = cv2.contourArea(c)
-        if area >= min_area:
-            cv2.drawContours(cleaned, [c], -1, 255, thickness=cv2.FILLED)
+    _num, labels, stats, _centroids = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    keep = stats[:, cv2.CC_STAT_AREA] >= min_area
+    keep[0] = False  # background
 
-    return cleaned
+    lut = np.where(keep, 255, 0).astype(np.uint8)
+    return lut[labels]
 
 
 def split_outer_holes_masks(binary: np.ndarray, min_area: int = 80) -> tuple[np.ndarray, np.ndarray]:
     """
     Split a binary mask (ink=255) into:
       - outer_mask: filled outer contours
-      - holes_mask: filled hole contours (children in CCOMP hierarchy)
+      - holes_mask: filled hole contours
 
-    Uses RETR_CCOMP hierarchy:
-      hierarchy[i][3] == -1  => outer contour
-      hierarchy[i][3] != -1  => hole (child)
+    Uses the RETR_TREE hierarchy:
+      hierarchy[i][3] == -1               => outer contour (depth 0)
+      parent of hierarchy[i][3] == -1     => hole (depth 1)
+    Deeper contours (islands inside holes, holes inside those) lie inside an
+    already filled depth-0/depth-1 contour and are smaller than it, so they never
+    change either mask. Skipping them lets each mask be filled with a single
+    batched drawContours call, whose even-odd fill would otherwise punch nested
+    contours back out.
     """
-    contours, hierarchy = cv2.findContours(binary, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    contours, hierarchy = cv2.findContours(binary, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
 
     outer = np.zeros_like(binary)
     holes = np.zeros_like(binary)
@@ -38,17 +46,43 @@ def split_outer_holes_masks(binary: np.ndarray, min_area: int = 80) -> tuple[np.
     if hierarchy is None or len(contours) == 0:
         return outer, holes
 
-    hier = hierarchy[0]
-    for i, c in enumerate(contours):
-        area = cv2.contourArea(c)
-        if area < min_area:
-            continue
+    parents = hierarchy[0][:, 3]
+    is_outer = parents == -1
+    # parents[-1] for outer contours is harmless: those rows are masked by ~is_outer
+    is_hole = ~is_outer & (parents[parents] == -1)
 
-        parent = hier[i][3]
-        if parent == -1:
-            cv2.drawContours(outer, [c], -1, 255, thickness=cv2.FILLED)
-        else:
-            cv2.drawContours(holes, [c], -1, 255, thickness=cv2.FILLED)
+    if min_area > 0:
+        big = _contour_areas(contours) >= min_area
+        is_outer &= big
+        is_hole &= big
+
+    outer_contours = [contours[i] for i in np.flatnonzero(is_outer)]
+    hole_contours = [contours[i] for i in np.flatnonzero(is_hole)]
+
+    # One fill pass per mask for all kept contours
+    if outer_contours:
+        cv2.drawContours(outer, outer_contours, -1, 255, thickness=cv2.FILLED)
+    if hole_contours:
+        cv2.drawContours(holes, hole_contours, -1, 255, thickness=cv2.FILLED)
 
     return outer, holes
 
+
+def _contour_areas(contours) -> np.ndarray:
+    """
+    Polygon areas of all contours (same as cv2.contourArea), via the shoelace
+    formula over the concatenated points in one vectorized pass instead of one
+    C call per contour.
+    """
+    lengths = np.fromiter((len(c) for c in contours), dtype=np.intp, count=len(contours))
+    pts = np.concatenate(contours).reshape(-1, 2).astype(np.float64)
+
+    starts = np.zeros(len(contours), dtype=np.intp)
+    np.cumsum(lengths[:-1], out=starts[1:])
+
+    # index of the next vertex, wrapping each contour's last vertex to its first
+    nxt = np.arange(1, len(pts) + 1)
+    nxt[starts + lengths - 1] = starts
+
+    cross = pts[:, 0] * pts[nxt, 1] - pts[:, 1] * pts[nxt, 0]
+    return 0.5 * np.abs(np.add.reduceat(cross, starts))
@@ -1,50 +1,92 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+import functools
+from typing import List
 
 import ezdxf
+import numpy as np
+from ezdxf.entities import LWPolyline, Spline
 
+from . import _export_kernels, _numba
 from .models import PathSegment, VectorPath
 
 
-Point = Tuple[float, float]
+# Segment boundary points closer than this (in pixels) are treated as shared
+_DEDUP_EPS = 1e-6
 
 
-def _sample_cubic_bezier(p0: Point, p1: Point, p2: Point, p3: Point, n: int) -> List[Point]:
-    # uniform sampling t in [0..1]
-    pts: list[Point] = []
-    for i in range(n + 1):
-        t = i / n
-        mt = 1.0 - t
-        x = (mt**3) * p0[0] + 3 * (mt**2) * t * p1[0] + 3 * mt * (t**2) * p2[0] + (t**3) * p3[0]
-        y = (mt**3) * p0[1] + 3 * (mt**2) * t * p1[1] + 3 * mt * (t**2) * p2[1] + (t**3) * p3[1]
-        pts.append((x, y))
-    return pts
+@functools.lru_cache(maxsize=8)
+def _cubic_basis(n: int) -> np.ndarray:
+    # (n + 1, 4) Bernstein weights for uniform t in [0..1]
+    t = np.linspace(0.0, 1.0, n + 1)
+    mt = 1.0 - t
+    return np.stack([mt**3, 3 * mt * mt * t, 3 * mt * t * t, t**3], axis=1)
 
 
-def _sample_quad_bezier(p0: Point, p1: Point, p2: Point, n: int) -> List[Point]:
-    pts: list[Point] = []
-    for i in range(n + 1):
-        t = i / n
-        mt = 1.0 - t
-        x = (mt**2) * p0[0] + 2 * mt * t * p1[0] + (t**2) * p2[0]
-        y = (mt**2) * p0[1] + 2 * mt * t * p1[1] + (t**2) * p2[1]
-        pts.append((x, y))
-    return pts
+@functools.lru_cache(maxsize=8)
+def _quad_basis(n: int) -> np.ndarray:
+    t = np.linspace(0.0, 1.0, n + 1)
+    mt = 1.0 - t
+    return np.stack([mt * mt, 2 * mt * t, t * t], axis=1)
 
 
-def _segment_to_points(seg: PathSegment, *, samples: int) -> List[Point]:
-    if seg.kind == "line":
-        return [seg.pts[0], seg.pts[-1]]
+def _sample_cubic_beziers(ctrl: np.ndarray, n: int) -> np.ndarray:
+    # (K, 4, 2) control points -> (K, n + 1, 2) samples, one broadcast matmul for all curves
+    return _cubic_basis(n) @ ctrl
 
-    if seg.kind == "cubic_bezier" and len(seg.pts) == 4:
-        return _sample_cubic_bezier(seg.pts[0], seg.pts[1], seg.pts[2], seg.pts[3], n=samples)
 
-    if seg.kind == "quad_bezier" and len(seg.pts) == 3:
-        return _sample_quad_bezier(seg.pts[0], seg.pts[1], seg.pts[2], n=samples)
+def _sample_quad_beziers(ctrl: np.ndarray, n: int) -> np.ndarray:
+    # (K, 3, 2) control points -> (K, n + 1, 2)
+    return _quad_basis(n) @ ctrl
 
-    # Fallback
-    return [seg.pts[0], seg.pts[-1]]
+
+def _sample_segments(segments: List[PathSegment], *, samples: int) -> List[np.ndarray]:
+    """
+    Per-segment point arrays: `samples` + 1 points per well-formed Bezier, with all
+    cubic (and all quadratic) Beziers of the path sampled in one batch; the two end
+    points for lines and for malformed curves.
+    """
+    seg_pts: List[np.ndarray] = [seg.pts[[0, -1]] for seg in segments]
+    cubic = [i for i, s in enumerate(segments) if s.kind == "cubic_bezier" and len(s.pts) == 4]
+    quad = [i for i, s in enumerate(segments) if s.kind == "quad_bezier" and len(s.pts) == 3]
+
+    if cubic:
+        sampled = _sample_cubic_beziers(np.stack([segments[i].pts for i in cubic]), samples)
+        for i, pts in zip(cubic, sampled):
+            seg_pts[i] = pts
+    if quad:
+        sampled = _sample_quad_beziers(np.stack([segments[i].pts for i in quad]), samples)
+        for i, pts in zip(quad, sampled):
+            seg_pts[i] = pts
+    return seg_pts
+
+
+def _join_segment_points(seg_pts: List[np.ndarray], eps: float = _DEDUP_EPS) -> np.ndarray:
+    """
+    Concatenate per-segment point arrays into one (N, 2) stream.
+    The first point of a segment is dropped when it coincides with the last point
+    of the previous segment, to avoid duplicating boundary points.
+    """
+    pts = np.concatenate(seg_pts)
+    starts = np.cumsum([len(p) for p in seg_pts[:-1]], dtype=np.intp)
+    if starts.size == 0:
+        return pts
+
+    dup = np.abs(pts[starts] - pts[starts - 1]).max(axis=1) <= eps
+    keep = np.ones(len(pts), dtype=bool)
+    keep[starts[dup]] = False
+    return pts[keep]
+
+
+def _line_path_points(pts: np.ndarray, eps: float = _DEDUP_EPS) -> np.ndarray:
+    """
+    Point stream of a path made only of two-point line segments, from its
+    VectorPath.coords. Same result as _join_segment_points over the segments.
+    """
+    # rows: start0, end0, start1, end1, ... -> drop start_i that repeats end_(i-1)
+    keep = np.ones(len(pts), dtype=bool)
+    keep[2::2] = np.abs(pts[2::2] - pts[1:-1:2]).max(axis=1) > eps
+    return pts[keep]
 
 
 def export_paths_to_dxf(
@@ -62,56 +104,57 @@ def export_paths_to_dxf(
     """
     if scale <= 0:
         raise ValueError("scale must be > 0")
+    if bezier_samples < 1:
+        raise ValueError("bezier_samples must be >= 1")
 
     doc = ezdxf.new(dxfversion="R2018")
     doc.units = ezdxf.units.MM
     msp = doc.modelspace()
 
     # Ensure layers exist
-    layers = {p.layer for p in paths} | {"OUTLINE", "HOLES", "REF"}
-    for layer in layers:
+    for layer in {p.layer for p in paths} | {"OUTLINE", "HOLES", "REF"}:
         if layer not in doc.layers:
-            doc.layers.new(name=layer)
+            doc.layers.add(layer)
 
     for vp in paths:
-        # Build a point stream (sampled for curves)
-        pts: list[Point] = []
-        has_curve = False
-
-        for seg in vp.segments:
-            seg_pts = _segment_to_points(seg, samples=bezier_samples)
-
-            if seg.kind in {"cubic_bezier", "quad_bezier"}:
-                has_curve = True
-
-            # Avoid duplicating boundary points between segments
-            if pts and seg_pts:
-                if _almost_same(pts[-1], seg_pts[0]):
-                    pts.extend(seg_pts[1:])
-                else:
-                    pts.extend(seg_pts)
-            else:
-                pts.extend(seg_pts)
-
-        # Apply scaling to mm
-        pts_mm = [(x * scale, y * scale) for (x, y) in pts]
-
-        if not pts_mm:
+        if not vp.segments:
             continue
 
-        attribs = {"layer": vp.layer}
+        # Build a point stream (sampled for curves), scaled to mm.
+        # ezdxf consumes plain sequences of points.
+        if all(seg.kind == "line" and len(seg.pts) == 2 for seg in vp.segments):
+            # Polygon-only paths (common): no sampling, always a polyline
+            has_curve = False
+            pts_mm = (_line_path_points(vp.coords) * scale).tolist()
+        elif _numba.HAVE_NUMBA:
+            has_curve = any(seg.kind in {"cubic_bezier", "quad_bezier"} for seg in vp.segments)
+            kinds, pts_flat, offsets = _export_kernels.flatten_segments(vp.segments)
+            pts = _export_kernels.sample_path(
+                kinds, pts_flat, offsets, bezier_samples, float(scale), _DEDUP_EPS
+            )
+            pts_mm = pts.tolist()
+        else:
+            has_curve = any(seg.kind in {"cubic_bezier", "quad_bezier"} for seg in vp.segments)
+            seg_pts = _sample_segments(vp.segments, samples=bezier_samples)
+            pts_mm = (_join_segment_points(seg_pts) * scale).tolist()
 
+        # Entities are built directly and bound via add_entity, skipping the
+        # msp.add_* factory path and its dxfattribs dict handling
         if prefer_splines and has_curve and len(pts_mm) >= 4:
             # Use spline with fit points (sampled). Close if needed.
-            spl = msp.add_spline(fit_points=pts_mm, dxfattribs=attribs)
+            entity = Spline()
+            entity.dxf.degree = 3
+            entity.fit_points = pts_mm
             if vp.is_closed:
-                spl.closed = True
+                entity.closed = True
         else:
             # Polyline fallback
-            msp.add_lwpolyline(pts_mm, close=vp.is_closed, dxfattribs=attribs)
+            entity = LWPolyline()
+            entity.set_points(pts_mm, format="xy")
+            entity.closed = vp.is_closed
 
-    doc.saveas(out_path)
+        entity.dxf.layer = vp.layer
+        msp.add_entity(entity)
 
+    doc.saveas(out_path)
 
-def _almost_same(a: Point, b: Point, eps: float = 1e-6) -> bool:
-    return abs(a[0] - b[0]) <= eps and abs(a[1] - b[1]) <= eps
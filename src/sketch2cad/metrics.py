@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass, asdict
 from typing import Any, Dict, Tuple
 
 import ezdxf
+import numpy as np
 
 
 BBox = Tuple[float, float, float, float]
@@ -25,65 +27,72 @@ def compute_dxf_metrics(dxf_path: str) -> DxfMetrics:
     msp = doc.modelspace()
     entities = list(msp)
 
-    entities_by_type: Dict[str, int] = {}
-    layers: Dict[str, int] = {}
+    types: list[str] = []
+    layer_names: list[str] = []
 
-    min_x = float("inf")
-    min_y = float("inf")
-    max_x = float("-inf")
-    max_y = float("-inf")
+    mins = np.full(2, np.inf)
+    maxs = np.full(2, -np.inf)
+
+    add_type = types.append
+    add_layer = layer_names.append
 
     for e in entities:
         t = e.dxftype()
-        entities_by_type[t] = entities_by_type.get(t, 0) + 1
-        layer = getattr(e.dxf, "layer", "0")
-        layers[layer] = layers.get(layer, 0) + 1
+        add_type(t)
+        try:
+            add_layer(e.dxf.layer)
+        except AttributeError:
+            add_layer("0")
 
         # Bounding box: handle common entity types we create
-        pts = _extract_points(e)
-        for x, y in pts:
-            min_x = min(min_x, x)
-            min_y = min(min_y, y)
-            max_x = max(max_x, x)
-            max_y = max(max_y, y)
-
-    if min_x == float("inf"):
+        pts = _extract_points(e, t)
+        if len(pts):
+            mins = np.minimum(mins, pts.min(axis=0))
+            maxs = np.maximum(maxs, pts.max(axis=0))
+
+    if np.isfinite(mins).all():
+        bbox = (float(mins[0]), float(mins[1]), float(maxs[0]), float(maxs[1]))
+    else:
         # no geometry
-        min_x = min_y = max_x = max_y = 0.0
+        bbox = (0.0, 0.0, 0.0, 0.0)
 
     return DxfMetrics(
         num_entities=len(entities),
-        entities_by_type=entities_by_type,
-        layers=layers,
-        bbox_mm=(min_x, min_y, max_x, max_y),
+        entities_by_type=dict(Counter(types)),
+        layers=dict(Counter(layer_names)),
+        bbox_mm=bbox,
     )
 
 
-def _extract_points(e) -> list[tuple[float, float]]:
+_NO_POINTS = np.empty((0, 2), dtype=np.float64)
+
+
+def _as_xy(points) -> np.ndarray:
+    arr = np.asarray(points, dtype=np.float64)
+    if arr.size == 0:
+        return _NO_POINTS
+    return arr.reshape(len(arr), -1)[:, :2]
+
+
+def _extract_points(e, t: str) -> np.ndarray:
     """
-    Best-effort extraction for entities used in this project:
+    Best-effort extraction for entities used in this project, as an (N, 2) array.
+    `t` is the entity's dxftype(), already looked up by the caller:
     - LWPOLYLINE: vertices
     - SPLINE: fit points / control points (fallback)
     """
-    t = e.dxftype()
-
     if t == "LWPOLYLINE":
-        return [(float(x), float(y)) for x, y, *_ in e.get_points("xyseb")]
+        return _as_xy(e.get_points("xy"))
 
     if t == "SPLINE":
-        pts = []
-        try:
-            fit = list(e.fit_points)
-            pts.extend([(float(p.x), float(p.y)) for p in fit])
-        except Exception:
-            pass
-        if not pts:
+        for attr in ("fit_points", "control_points"):
             try:
-                ctrl = list(e.control_points)
-                pts.extend([(float(p.x), float(p.y)) for p in ctrl])
+                pts = _as_xy(getattr(e, attr))
             except Exception:
-                pass
-        return pts
+                continue
+            if len(pts):
+                return pts
+        return _NO_POINTS
 
     # Unknown: no points
-    return []
+    return _NO_POINTS
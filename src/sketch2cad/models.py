@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass, asdict
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 Point = Tuple[float, float]
 
 
@@ -11,10 +13,20 @@ class PathSegment:
     """
     Minimal segment model.
     kind: "line" | "cubic_bezier" | "quad_bezier"
-    pts: list of points (interpretation depends on kind)
+    pts: (n, 2) float64 array of points (interpretation depends on kind);
+         a sequence of (x, y) points is converted on construction
     """
     kind: str
-    pts: List[Point]
+    pts: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.pts = np.asarray(self.pts, dtype=np.float64).reshape(-1, 2)
+
+    def __eq__(self, other: object) -> bool:
+        # The generated __eq__ would compare the arrays inside a tuple, which raises
+        if not isinstance(other, PathSegment):
+            return NotImplemented
+        return self.kind == other.kind and np.array_equal(self.pts, other.pts)
 
 
 @dataclass
@@ -26,6 +38,13 @@ class VectorPath:
     is_closed: bool = False
     layer: str = "OUTLINE"
 
+    @property
+    def coords(self) -> np.ndarray:
+        """All segment points, concatenated in order as one (N, 2) array."""
+        if not self.segments:
+            return np.empty((0, 2), dtype=np.float64)
+        return np.concatenate([seg.pts for seg in self.segments])
+
 
 @dataclass
 class PipelineConfig:
@@ -47,7 +66,8 @@ class PipelineConfig:
 
     # Optional toggles
     use_contours_filter: bool = True
-    debug_dump: bool = False
+    debug_dump: bool = False  # same as debug_level=2
+    debug_level: int = 0  # 0=off, 1=binary.png, 2=also masks and potrace SVGs
     debug_dir: str = "./examples/output/_debug"
 
 
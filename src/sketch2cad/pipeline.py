@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
 import traceback
 from pathlib import Path
 
 import cv2
 
+from . import _jsonio
 from .contours import filter_contours, split_outer_holes_masks
 from .export_dxf import export_paths_to_dxf
 from .models import PipelineConfig, Report
@@ -14,6 +14,10 @@ from .scale_reference import compute_mm_per_px
 from .vectorize_potrace import vectorize_with_potrace
 
 
+# Debug PNGs favour encode speed over size (zlib level 1 instead of the default 3)
+_DEBUG_PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+
+
 def run_pipeline(cfg: PipelineConfig) -> Report:
     errors: list[str] = []
     try:
@@ -35,32 +39,34 @@ def run_pipeline(cfg: PipelineConfig) -> Report:
 
         mm_per_px = compute_mm_per_px(cfg)
 
+        level = _debug_level(cfg)
+        debug_dir = Path(cfg.debug_dir)
         debug_outer_svg = None
         debug_holes_svg = None
-        if cfg.debug_dump:
-            Path(cfg.debug_dir).mkdir(parents=True, exist_ok=True)
-            debug_bin = Path(cfg.debug_dir) / "binary.png"
-            cv2.imwrite(str(debug_bin), binary)
-            debug_outer_svg = str(Path(cfg.debug_dir) / "potrace_outline.svg")
-            debug_holes_svg = str(Path(cfg.debug_dir) / "potrace_holes.svg")
+        if level >= 1:
+            debug_dir.mkdir(parents=True, exist_ok=True)
+            cv2.imwrite(str(debug_dir / "binary.png"), binary, _DEBUG_PNG_PARAMS)
+        if level >= 2:
+            debug_outer_svg = str(debug_dir / "potrace_outline.svg")
+            debug_holes_svg = str(debug_dir / "potrace_holes.svg")
 
         # Split into outer and holes masks (both ink=255)
         outer_mask, holes_mask = split_outer_holes_masks(binary, min_area=120)
 
-        if cfg.debug_dump:
-            cv2.imwrite(str(Path(cfg.debug_dir) / "mask_outer.png"), outer_mask)
-            cv2.imwrite(str(Path(cfg.debug_dir) / "mask_holes.png"), holes_mask)
+        if level >= 2:
+            cv2.imwrite(str(debug_dir / "mask_outer.png"), outer_mask, _DEBUG_PNG_PARAMS)
+            cv2.imwrite(str(debug_dir / "mask_holes.png"), holes_mask, _DEBUG_PNG_PARAMS)
 
         # Vectorize separately to keep layer semantics
         paths_outline = vectorize_with_potrace(outer_mask, debug_svg_path=debug_outer_svg)
         for p in paths_outline:
             p.layer = "OUTLINE"
 
-        paths_holes = []
-        if holes_mask is not None and holes_mask.max() > 0:
-            paths_holes = vectorize_with_potrace(holes_mask, debug_svg_path=debug_holes_svg)
-            for p in paths_holes:
-                p.layer = "HOLES"
+        # An empty holes mask costs no potrace run: vectorization bails out on an
+        # empty ink bounding box, so no separate full-image max() scan is needed.
+        paths_holes = vectorize_with_potrace(holes_mask, debug_svg_path=debug_holes_svg)
+        for p in paths_holes:
+            p.layer = "HOLES"
 
         paths = paths_outline + paths_holes
 
@@ -103,8 +109,12 @@ def run_pipeline(cfg: PipelineConfig) -> Report:
         return rep
 
 
+def _debug_level(cfg: PipelineConfig) -> int:
+    # debug_dump predates debug_level and means "dump everything"
+    return max(cfg.debug_level, 2 if cfg.debug_dump else 0)
+
+
 def _write_report(output_dxf: str, report: Report) -> None:
     out = Path(output_dxf)
     report_path = out.with_suffix(out.suffix + ".report.json")
-    report_path.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
-
+    report_path.write_bytes(_jsonio.dumps(report.to_dict()))
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 import cv2
 import numpy as np
 
@@ -15,12 +17,20 @@ def preprocess_to_binary(
     """
     Converts BGR image to binary (ink=255, background=0).
     Robust against shadows via adaptive thresholding.
+
+    When OpenCL is available the image is uploaded once as a cv2.UMat, so all
+    stages run on the device (OpenCV transparent API) and only the final mask
+    is downloaded. Otherwise the same calls run on the host arrays.
     """
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    use_ocl = _use_opencl()
+    src = cv2.UMat(bgr) if use_ocl else bgr
+
+    gray = cv2.cvtColor(src, cv2.COLOR_BGR2GRAY)
 
     if blur_ksize and blur_ksize > 1:
         k = blur_ksize if blur_ksize % 2 == 1 else blur_ksize + 1
-        gray = cv2.GaussianBlur(gray, (k, k), 0)
+        gk = _gaussian_kernel(k)
+        gray = cv2.sepFilter2D(gray, -1, gk, gk)
 
     bs = block_size if block_size % 2 == 1 else block_size + 1
     bw = cv2.adaptiveThreshold(
@@ -33,13 +43,26 @@ def preprocess_to_binary(
     )
 
     if morph_kernel and morph_kernel > 1:
-        kernel = cv2.getStructuringElement(
-            cv2.MORPH_ELLIPSE, (morph_kernel, morph_kernel)
-        )
+        kernel = _ellipse_kernel(morph_kernel)
         it_close = max(1, morph_iters)
         bw = cv2.morphologyEx(bw, cv2.MORPH_CLOSE, kernel, iterations=it_close)
         bw = cv2.morphologyEx(
             bw, cv2.MORPH_OPEN, kernel, iterations=max(1, morph_iters // 2)
         )
 
-    return bw
+    return bw.get() if use_ocl else bw
+
+
+def _use_opencl() -> bool:
+    return cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+
+
+@lru_cache(maxsize=None)
+def _gaussian_kernel(k: int) -> np.ndarray:
+    # 1-D kernel for both axes; sigma=0 derives sigma from k like GaussianBlur does
+    return cv2.getGaussianKernel(k, 0)
+
+
+@lru_cache(maxsize=None)
+def _ellipse_kernel(size: int) -> np.ndarray:
+    return cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (size, size))
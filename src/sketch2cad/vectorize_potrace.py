@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+import functools
+import io
+import itertools
 import re
 import shutil
 import subprocess
-import tempfile
+from array import array
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 from xml.etree import ElementTree as ET
 
 import cv2
 import numpy as np
-from svgpathtools import svg2paths2, Line, CubicBezier, QuadraticBezier
 
+from . import _svg_kernels
 from .models import PathSegment, VectorPath
 
 # -----------------------------
@@ -43,21 +46,31 @@ def _affine_mul(m1: Affine, m2: Affine) -> Affine:
     )
 
 
-def _affine_apply(m: Affine, x: float, y: float) -> tuple[float, float]:
+def _affine_matrix(m: Affine) -> np.ndarray:
     a, b, c, d, e, f = m
-    return (a * x + c * y + e, b * x + d * y + f)
+    return np.array([[a, c, e], [b, d, f], [0.0, 0.0, 1.0]])
 
 
-_transform_re = re.compile(r"(translate|scale|matrix)\s*\(([^)]*)\)")
+def _affine_apply_array(m: Affine, pts: np.ndarray) -> np.ndarray:
+    # (N, 2) points -> (N, 2) points; the identity (plain SVGs without a group
+    # transform) returns `pts` itself
+    if m == _affine_identity():
+        return pts
+    return _svg_kernels.apply_affine(pts, *m)
 
 
+_transform_re = re.compile(r"(translate|scale|matrix)\s*\(([^)]*)\)", re.ASCII)
+_transform_args_re = re.compile(r"[ ,]+", re.ASCII)
+
+@functools.lru_cache(maxsize=256)
 def _parse_transform_list(transform: str) -> Affine:
     """
     Parses a limited subset of SVG transforms:
       - translate(tx[,ty])
       - scale(sx[,sy])
       - matrix(a,b,c,d,e,f)
-    Returns a single affine matrix.
+    Returns a single affine matrix (memoized: potrace writes the same transform for
+    every image of a given size).
     SVG applies transforms from right to left. For a list "T1 T2", points are transformed by T2 then T1.
     We compose accordingly.
     """
@@ -65,145 +78,283 @@ def _parse_transform_list(transform: str) -> Affine:
     if not transform:
         return _affine_identity()
 
-    mats: list[Affine] = []
+    mats: list[np.ndarray] = []
     for m in _transform_re.finditer(transform):
         kind = m.group(1)
-        args = [float(x) for x in re.split(r"[ ,]+", m.group(2).strip()) if x]
+        args = [float(x) for x in _transform_args_re.split(m.group(2).strip()) if x]
 
         if kind == "translate":
             tx = args[0] if len(args) >= 1 else 0.0
             ty = args[1] if len(args) >= 2 else 0.0
-            mats.append((1.0, 0.0, 0.0, 1.0, tx, ty))
+            mats.append(_affine_matrix((1.0, 0.0, 0.0, 1.0, tx, ty)))
 
         elif kind == "scale":
             sx = args[0] if len(args) >= 1 else 1.0
             sy = args[1] if len(args) >= 2 else sx
-            mats.append((sx, 0.0, 0.0, sy, 0.0, 0.0))
+            mats.append(_affine_matrix((sx, 0.0, 0.0, sy, 0.0, 0.0)))
 
         elif kind == "matrix":
             if len(args) != 6:
                 continue
-            a, b, c, d, e, f = args
-            mats.append((a, b, c, d, e, f))
+            mats.append(_affine_matrix(tuple(args)))
 
-    # Compose right-to-left
-    out = _affine_identity()
-    for m in reversed(mats):
-        out = _affine_mul(m, out)
-    return out
+    # "T1 T2" maps points by T2 first, i.e. M = T1 @ T2
+    out = functools.reduce(np.matmul, mats, np.eye(3))
+    return (
+        float(out[0, 0]),
+        float(out[1, 0]),
+        float(out[0, 1]),
+        float(out[1, 1]),
+        float(out[0, 2]),
+        float(out[1, 2]),
+    )
 
 
-def _extract_group_transform(svg_text: str) -> Affine:
+def _extract_group_transform(svg_bytes: bytes) -> Affine:
     """
     Potrace SVG commonly uses a <g transform="translate(... ) scale(... )"> wrapper.
-    We try to extract the first <g> transform if present.
+    We try to extract the first <g> transform if present. Parsing stops at that
+    <g>, which potrace writes before any path data.
     """
     try:
-        root = ET.fromstring(svg_text)
-    except Exception:
-        return _affine_identity()
-
-    for el in root.iter():
-        if el.tag.endswith("g") and "transform" in el.attrib:
-            return _parse_transform_list(el.attrib.get("transform", ""))
+        for _event, el in ET.iterparse(io.BytesIO(svg_bytes), events=("start",)):
+            if el.tag.rpartition("}")[2] == "g" and "transform" in el.attrib:
+                return _parse_transform_list(el.attrib["transform"])
+    except ET.ParseError:
+        pass
     return _affine_identity()
 
 
 # -----------------------------
-# Potrace integration
+# SVG path data
 # -----------------------------
 
+_KIND_NUM_POINTS = {"line": 2, "cubic_bezier": 4, "quad_bezier": 3}
 
-def _ensure_potrace() -> None:
-    if shutil.which("potrace") is None:
-        raise RuntimeError(
-            "potrace not found. Install on Ubuntu/Debian: sudo apt install -y potrace"
-        )
+# One match per command: (letter, argument text up to the next command)
+_PATH_CMD_RE = re.compile(r"([MmZzLlHhVvCcSsQqTtAa])([^MmZzLlHhVvCcSsQqTtAa]*)")
+_PATH_NUM_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
 
+# Numbers consumed per repetition of each command
+_NUM_ARGS = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
 
-def binary_to_svg(binary: np.ndarray, out_svg: Path) -> None:
+Subpath = Tuple[List[str], bool]
+
+
+def _parse_path_data(d: str, coords: array, subpaths: List[Subpath]) -> None:
     """
-    Uses potrace CLI to convert a binary bitmap into an SVG file.
-    We set unit (-u 1) to reduce surprising scaling factors.
+    Parses an SVG path "d" attribute.
 
-    Important: Potrace expects black shapes on white background.
-    Our preprocess produces ink=255 on background=0 (THRESH_BINARY_INV),
-    so we invert before feeding potrace.
+    Segment points are appended to `coords` as flat x, y floats (2 points per line,
+    3 per quadratic, 4 per cubic Bezier), and one (segment kinds, is_closed) entry
+    per subpath is appended to `subpaths`. Potrace writes a shape and its holes as
+    subpaths of one <path>, so every "M" starts a new entry.
+    Arcs are not expected in potrace output and are kept as a line between their end points.
     """
-    _ensure_potrace()
-    out_svg.parent.mkdir(parents=True, exist_ok=True)
+    kinds: list[str] = []
+    cx = cy = 0.0  # current point
+    sx = sy = 0.0  # subpath start
+    rx = ry = 0.0  # last control point, reflected by S/T
+    prev = ""
+
+    for cmd, arg_text in _PATH_CMD_RE.findall(d):
+        up = cmd.upper()
+        rel = cmd != up
+        if up == "Z":
+            if (cx, cy) != (sx, sy):
+                kinds.append("line")
+                coords.extend((cx, cy, sx, sy))
+            if kinds:
+                subpaths.append((kinds, True))
+                kinds = []
+            cx, cy = sx, sy
+            prev = up
+            continue
+
+        args = list(map(float, _PATH_NUM_RE.findall(arg_text)))
+        n = _NUM_ARGS[up]
+        count = len(args) // n
+        if count == 0:
+            continue
+
+        # Potrace output is almost only "c" and "l" runs: the command is dispatched
+        # once per run, and the kinds of the whole run are added at once
+        if up == "C":
+            for j in range(0, count * n, n):
+                x1, y1, rx, ry, x, y = args[j : j + n]
+                if rel:
+                    x1 += cx
+                    y1 += cy
+                    rx += cx
+                    ry += cy
+                    x += cx
+                    y += cy
+                coords.extend((cx, cy, x1, y1, rx, ry, x, y))
+                cx, cy = x, y
+            kinds += ["cubic_bezier"] * count
+            prev = up
+            continue
+
+        if up == "L":
+            for j in range(0, count * n, n):
+                x, y = args[j : j + n]
+                if rel:
+                    x += cx
+                    y += cy
+                coords.extend((cx, cy, x, y))
+                cx, cy = x, y
+            kinds += ["line"] * count
+            prev = up
+            continue
+
+        for j in range(0, count * n, n):
+            a = args[j : j + n]
+            ox, oy = (cx, cy) if rel else (0.0, 0.0)
+
+            if up == "M" and j == 0:
+                if kinds:
+                    subpaths.append((kinds, (cx, cy) == (sx, sy)))
+                    kinds = []
+                cx, cy = sx, sy = a[0] + ox, a[1] + oy
+                prev = up
+                continue
 
-    with tempfile.TemporaryDirectory() as td:
-        td_path = Path(td)
-        inp = td_path / "input.pgm"
+            if up in ("M", "H", "V", "A"):
+                if up == "H":
+                    x, y = a[0] + ox, cy
+                elif up == "V":
+                    x, y = cx, a[0] + oy
+                else:
+                    x, y = a[-2] + ox, a[-1] + oy
+                kinds.append("line")
+                coords.extend((cx, cy, x, y))
+            elif up == "S":
+                if prev in ("C", "S"):
+                    x1, y1 = 2 * cx - rx, 2 * cy - ry
+                else:
+                    x1, y1 = cx, cy
+                rx, ry = a[0] + ox, a[1] + oy
+                x, y = a[2] + ox, a[3] + oy
+                kinds.append("cubic_bezier")
+                coords.extend((cx, cy, x1, y1, rx, ry, x, y))
+            else:  # Q, T
+                if up == "Q":
+                    rx, ry = a[0] + ox, a[1] + oy
+                elif prev in ("Q", "T"):
+                    rx, ry = 2 * cx - rx, 2 * cy - ry
+                else:
+                    rx, ry = cx, cy
+                x, y = a[-2] + ox, a[-1] + oy
+                kinds.append("quad_bezier")
+                coords.extend((cx, cy, rx, ry, x, y))
+
+            cx, cy = x, y
+            prev = up
+
+    if kinds:
+        subpaths.append((kinds, (cx, cy) == (sx, sy)))
 
-        inv = 255 - binary
-        cv2.imwrite(str(inp), inv)
 
-        cmd = ["potrace", str(inp), "-s", "-u", "1", "-o", str(out_svg)]
-        proc = subprocess.run(cmd, capture_output=True, text=True)
-        if proc.returncode != 0:
+# -----------------------------
+# Potrace integration
+# -----------------------------
+
+
+# Resolved potrace executable; only a successful lookup is kept, so installing
+# potrace while the watch service runs still takes effect
+_POTRACE: Optional[str] = None
+
+
+def _ensure_potrace() -> str:
+    global _POTRACE
+    if _POTRACE is None:
+        _POTRACE = shutil.which("potrace")
+        if _POTRACE is None:
             raise RuntimeError(
-                f"potrace failed (rc={proc.returncode}): {proc.stderr.strip()}"
+                "potrace not found. Install on Ubuntu/Debian: sudo apt install -y potrace"
             )
+    return _POTRACE
+
 
+def _to_pbm(binary: np.ndarray) -> bytes:
+    # Binary PBM (P4): rows of 1-bit pixels, MSB first, each row padded to a whole byte
+    h, w = binary.shape[:2]
+    packed = np.packbits(binary > 127, axis=1)
+    return b"P4\n%d %d\n" % (w, h) + packed.tobytes()
 
-def svg_to_paths(svg_path: Path, *, layer: str = "OUTLINE") -> List[VectorPath]:
+
+def _run_potrace(binary: np.ndarray) -> bytes:
+    """
+    Traces `binary` with the potrace CLI and returns the SVG document.
+    The bitmap goes in over stdin and the SVG comes back over stdout ("-"),
+    so nothing touches the filesystem.
+    We set unit (-u 1) to reduce surprising scaling factors.
+
+    Important: Potrace traces black shapes on white background.
+    Our preprocess produces ink=255 on background=0 (THRESH_BINARY_INV);
+    in a PBM bit 1 is black, so ink maps to set bits without inverting.
+    """
+    # Absolute path: exec skips the $PATH search
+    cmd = [_ensure_potrace(), "-", "-s", "-u", "1", "-o", "-"]
+    proc = subprocess.run(cmd, input=_to_pbm(binary), capture_output=True)
+    if proc.returncode != 0:
+        stderr = proc.stderr.decode("utf-8", errors="replace")
+        raise RuntimeError(f"potrace failed (rc={proc.returncode}): {stderr.strip()}")
+    return proc.stdout
+
+
+def binary_to_svg(binary: np.ndarray, out_svg: Path) -> None:
+    """
+    Uses potrace CLI to convert a binary bitmap into an SVG file.
+    """
+    svg_bytes = _run_potrace(binary)
+    out_svg.parent.mkdir(parents=True, exist_ok=True)
+    out_svg.write_bytes(svg_bytes)
+
+
+def svg_to_paths(
+    svg_path: Union[Path, bytes],
+    *,
+    layer: str = "OUTLINE",
+    origin: Tuple[float, float] = (0.0, 0.0),
+) -> List[VectorPath]:
     """
     Parse SVG paths (Potrace output) to VectorPaths.
 
+    `svg_path` is an SVG file, or the SVG document itself as bytes.
+
     We:
     - read svg text
     - extract group transform (common in potrace output)
-    - parse paths using svgpathtools
-    - convert segments to our internal representation
-    - apply group transform to all points
+    - parse the "d" attribute of every <path>, one VectorPath per subpath
+    - apply group transform to all points, shifted by `origin`
+      (used when the SVG was traced from an image crop)
     """
-    svg_text = svg_path.read_text(encoding="utf-8", errors="replace")
-    gxf = _extract_group_transform(svg_text)
+    svg_bytes = svg_path if isinstance(svg_path, bytes) else Path(svg_path).read_bytes()
+    gxf = _extract_group_transform(svg_bytes)
+    if origin != (0.0, 0.0):
+        gxf = _affine_mul((1.0, 0.0, 0.0, 1.0, float(origin[0]), float(origin[1])), gxf)
 
-    paths, path_attrs, _svg_attrs = svg2paths2(str(svg_path))
+    coords = array("d")
+    subpaths: list[Subpath] = []
+    for _event, el in ET.iterparse(io.BytesIO(svg_bytes)):
+        if el.tag.rpartition("}")[2] == "path":
+            _parse_path_data(el.get("d", ""), coords, subpaths)
+        el.clear()
+
+    pts = _affine_apply_array(gxf, np.frombuffer(coords, dtype=np.float64).reshape(-1, 2))
 
     out: list[VectorPath] = []
-    for p, attrs in zip(paths, path_attrs):
-        lp = layer
-
-        segments: list[PathSegment] = []
-        for seg in p:
-            if isinstance(seg, Line):
-                x0, y0 = seg.start.real, seg.start.imag
-                x1, y1 = seg.end.real, seg.end.imag
-                x0, y0 = _affine_apply(gxf, float(x0), float(y0))
-                x1, y1 = _affine_apply(gxf, float(x1), float(y1))
-                segments.append(PathSegment(kind="line", pts=[(x0, y0), (x1, y1)]))
-
-            elif isinstance(seg, CubicBezier):
-                pts = [
-                    (seg.start.real, seg.start.imag),
-                    (seg.control1.real, seg.control1.imag),
-                    (seg.control2.real, seg.control2.imag),
-                    (seg.end.real, seg.end.imag),
-                ]
-                pts2 = [_affine_apply(gxf, float(x), float(y)) for (x, y) in pts]
-                segments.append(PathSegment(kind="cubic_bezier", pts=pts2))
-
-            elif isinstance(seg, QuadraticBezier):
-                pts = [
-                    (seg.start.real, seg.start.imag),
-                    (seg.control.real, seg.control.imag),
-                    (seg.end.real, seg.end.imag),
-                ]
-                pts2 = [_affine_apply(gxf, float(x), float(y)) for (x, y) in pts]
-                segments.append(PathSegment(kind="quad_bezier", pts=pts2))
-
-            else:
-                x0, y0 = seg.start.real, seg.start.imag
-                x1, y1 = seg.end.real, seg.end.imag
-                x0, y0 = _affine_apply(gxf, float(x0), float(y0))
-                x1, y1 = _affine_apply(gxf, float(x1), float(y1))
-                segments.append(PathSegment(kind="line", pts=[(x0, y0), (x1, y1)]))
-
-        out.append(VectorPath(segments=segments, is_closed=p.isclosed(), layer=lp))
+    i = 0
+    for kinds, is_closed in subpaths:
+        # Row offsets of each segment in `pts`; segments are row views, no per-point objects
+        ends = list(itertools.accumulate(map(_KIND_NUM_POINTS.__getitem__, kinds), initial=i))
+        segments = [
+            PathSegment(kind=kind, pts=pts[i0:i1]) for kind, i0, i1 in zip(kinds, ends, ends[1:])
+        ]
+        i = ends[-1]
+
+        out.append(VectorPath(segments=segments, is_closed=is_closed, layer=layer))
 
     return out
 
@@ -215,17 +366,22 @@ def vectorize_with_potrace(
     """
     End-to-end vectorization:
     binary -> (potrace) -> svg -> (parse) -> VectorPath list
-    """
-    with tempfile.TemporaryDirectory() as td:
-        td_path = Path(td)
-        svg = td_path / "out.svg"
-        binary_to_svg(binary, svg)
-
-        if debug_svg_path:
-            Path(debug_svg_path).parent.mkdir(parents=True, exist_ok=True)
-            Path(debug_svg_path).write_text(
-                svg.read_text(encoding="utf-8", errors="replace"),
-                encoding="utf-8",
-            )
 
-        return svg_to_paths(svg)
+    Only the bounding box of the ink is traced; drawings often cover a small part
+    of a high-resolution photo and potrace's work scales with the bitmap area.
+    The crop offset is added back when parsing, so paths stay in image pixels.
+    With `debug_svg_path` the whole mask is traced instead, so that the debug SVG
+    lines up with the debug PNGs.
+    """
+    x0, y0, w, h = cv2.boundingRect(binary)
+    if w == 0 or h == 0:
+        return []
+
+    if debug_svg_path:
+        svg_bytes = _run_potrace(binary)
+        Path(debug_svg_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(debug_svg_path).write_bytes(svg_bytes)
+        return svg_to_paths(svg_bytes)
+
+    svg_bytes = _run_potrace(binary[y0 : y0 + h, x0 : x0 + w])
+    return svg_to_paths(svg_bytes, origin=(x0, y0))
@@ -1,17 +1,28 @@
 from __future__ import annotations
 
+import functools
+import logging
+import multiprocessing
 import os
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
+import cv2
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver
 
 from .models import PipelineConfig
 from .pipeline import run_pipeline
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class WatchConfig:
@@ -19,89 +30,263 @@ class WatchConfig:
     output_dir: str
     stable_checks: int = 3
     stable_interval_ms: int = 250
+    workers: Optional[int] = None  # None: one per CPU
+
+
+# Tuple, for str.endswith: most events are rejected before a Path is built
+_ACCEPTED_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+# Inputs whose (size, mtime) is remembered; the oldest are forgotten first
+_SUBMITTED_SIZE = 1024
+
+
+def _accepted(src_path: str) -> bool:
+    return src_path.lower().endswith(_ACCEPTED_SUFFIXES)
+
+
+def _emits_close_events(observer: BaseObserver) -> bool:
+    """
+    True if the observer reports IN_CLOSE_WRITE as on_closed (inotify), so no size
+    polling is needed. Other backends, including the polling fallback, never do.
+    """
+    try:
+        from watchdog.observers.inotify import InotifyObserver
+    except Exception:
+        # Not Linux, or a libc without inotify (watchdog raises UnsupportedLibcError)
+        return False
+    return isinstance(observer, InotifyObserver)
 
 
 def _is_file_stable(path: Path, checks: int, interval_ms: int) -> bool:
-    last = None
+    """True if the file size is unchanged over `checks` samples, `interval_ms` apart."""
+    try:
+        last = path.stat().st_size
+    except FileNotFoundError:
+        return False
     for _ in range(checks):
+        time.sleep(interval_ms / 1000.0)
         try:
             size = path.stat().st_size
         except FileNotFoundError:
             return False
-        if last is not None and size != last:
-            last = size
-        else:
-            # first measurement or unchanged
-            pass
-        last = size
-        time.sleep(interval_ms / 1000.0)
-    # stable if the last N samples were equal (we only tracked last, but size changes reset)
-    # For simplicity: accept stability if file exists and last sample exists.
+        if size != last:
+            return False
     return True
 
 
+def _init_worker() -> None:
+    # One process per file already uses every core; keep OpenCV single-threaded
+    cv2.setNumThreads(1)
+
+
+def _process_pool(workers: Optional[int]) -> ProcessPoolExecutor:
+    # spawn, not fork: the pool is (re)created while the observer threads are running
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
+
+
+def _run_one(input_path: str, output_dir: str) -> None:
+    """Runs the pipeline for one input file (in a worker process)."""
+    path = Path(input_path)
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    failed_dir = out_dir / "_failed"
+    failed_dir.mkdir(parents=True, exist_ok=True)
+
+    out_dxf = out_dir / (path.stem + ".dxf")
+
+    # Default: require explicit scaling per run; for watch mode you can set env vars
+    ref_mm = os.getenv("SKETCH2CAD_REF_MM")
+    ref_px = os.getenv("SKETCH2CAD_REF_PX")
+
+    pcfg = PipelineConfig(
+        input_path=str(path),
+        output_dxf=str(out_dxf),
+        ref_mm=float(ref_mm) if ref_mm else None,
+        ref_px=float(ref_px) if ref_px else None,
+    )
+
+    rep = run_pipeline(pcfg)
+    if rep.status != "ok":
+        # Move input to failed folder to avoid re-processing loops
+        try:
+            target = failed_dir / path.name
+            if not target.exists():
+                path.rename(target)
+        except Exception:
+            # best-effort only
+            pass
+
+
 class _Handler(FileSystemEventHandler):
-    def __init__(self, cfg: WatchConfig):
+    def __init__(
+        self,
+        cfg: WatchConfig,
+        executor: Executor,
+        *,
+        close_events: bool = False,
+        executor_factory: Optional[Callable[[], Executor]] = None,
+    ):
         self.cfg = cfg
+        self.executor = executor
+        # Replaces `executor` when a worker process dies and breaks the pool
+        self.executor_factory = executor_factory
+        # True: rely on on_closed (see _emits_close_events). False: on_modified plus
+        # size polling, which works with every observer backend.
+        self.close_events = close_events
+        # Output stem -> input being processed. a.png and a.jpg both write a.dxf and
+        # its report, so at most one input per stem runs at a time.
+        self._running: dict[str, str] = {}
+        # Output stem -> inputs waiting for the running one, in arrival order
+        self._waiting: dict[str, dict[str, None]] = {}
+        # (size, mtime) of recently submitted inputs, so a file is not run twice unchanged
+        self._submitted: OrderedDict[str, tuple[int, int]] = OrderedDict()
+        self._lock = threading.Lock()
 
     def on_created(self, event):
-        if event.is_directory:
+        if event.is_directory or not _accepted(event.src_path):
             return
-        self._handle(Path(event.src_path))
+        path = Path(event.src_path)
+        if self.close_events:
+            # Written in place: on_closed follows once the writer is done.
+            # Non-empty on creation: moved in from outside the folder, so no close event
+            # comes, and the content is complete, so no size polling on the observer thread.
+            try:
+                if path.stat().st_size == 0:
+                    return
+            except FileNotFoundError:
+                return
+            self._handle(path, wait=False)
+            return
+        self._handle(path)
 
     def on_modified(self, event):
-        if event.is_directory:
+        if event.is_directory or self.close_events or not _accepted(event.src_path):
             return
         # Some exporters write then modify; we handle both
         self._handle(Path(event.src_path))
 
-    def _handle(self, path: Path):
-        if path.suffix.lower() not in {".png", ".jpg", ".jpeg"}:
+    def on_closed(self, event):
+        if event.is_directory or not _accepted(event.src_path):
+            return
+        self._handle(Path(event.src_path), wait=False)
+
+    def on_moved(self, event):
+        if event.is_directory or not _accepted(event.dest_path):
+            return
+        # Renamed into place (e.g. "x.png.part" -> "x.png"): the content is complete
+        self._handle(Path(event.dest_path), wait=False)
+
+    def _handle(self, path: Path, *, wait: bool = True):
+        if wait and not _is_file_stable(path, self.cfg.stable_checks, self.cfg.stable_interval_ms):
             return
 
-        if not _is_file_stable(path, self.cfg.stable_checks, self.cfg.stable_interval_ms):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
             return
+        sig = (st.st_size, st.st_mtime_ns)
 
-        out_dir = Path(self.cfg.output_dir)
-        out_dir.mkdir(parents=True, exist_ok=True)
-        failed_dir = out_dir / "_failed"
-        failed_dir.mkdir(parents=True, exist_ok=True)
+        key = str(path)
+        stem = path.stem
+        with self._lock:
+            # Unchanged since it was last submitted (also absorbs event storms)
+            if self._submitted.get(key) == sig:
+                return
+            running = self._running.get(stem)
+            self._submitted[key] = sig
+            self._submitted.move_to_end(key)
+            if len(self._submitted) > _SUBMITTED_SIZE:
+                self._submitted.popitem(last=False)
+            if running is not None:
+                # Includes key == running: the file was rewritten while being processed,
+                # so it runs again once the current job is done
+                self._waiting.setdefault(stem, {})[key] = None
+                return
+            self._running[stem] = key
 
-        out_dxf = out_dir / (path.stem + ".dxf")
+        self._submit(stem, key)
 
-        # Default: require explicit scaling per run; for watch mode you can set env vars
-        ref_mm = os.getenv("SKETCH2CAD_REF_MM")
-        ref_px = os.getenv("SKETCH2CAD_REF_PX")
+    def _submit(self, stem: str, key: str) -> None:
+        executor = self.executor
+        try:
+            try:
+                fut = executor.submit(_run_one, key, self.cfg.output_dir)
+            except BrokenProcessPool:
+                # A worker died since the last submit; retry once on a new pool
+                executor = self._replace_executor(executor)
+                fut = executor.submit(_run_one, key, self.cfg.output_dir)
+        except Exception:
+            logger.exception("could not queue %s", key)
+            self._finish(stem)
+            return
 
-        pcfg = PipelineConfig(
-            input_path=str(path),
-            output_dxf=str(out_dxf),
-            ref_mm=float(ref_mm) if ref_mm else None,
-            ref_px=float(ref_px) if ref_px else None,
+        fut.add_done_callback(
+            lambda fut, stem=stem, key=key, executor=executor: self._done(stem, key, executor, fut)
         )
 
-        rep = run_pipeline(pcfg)
-        if rep.status != "ok":
-            # Move input to failed folder to avoid re-processing loops
-            try:
-                target = failed_dir / path.name
-                if not target.exists():
-                    path.rename(target)
-            except Exception:
-                # best-effort only
-                pass
+    def _done(self, stem: str, key: str, executor: Executor, fut: Future) -> None:
+        exc = None if fut.cancelled() else fut.exception()
+        if exc is not None:
+            logger.error("processing %s failed: %r", key, exc)
+            if isinstance(exc, BrokenProcessPool):
+                self._replace_executor(executor)
+        self._finish(stem)
+
+    def _finish(self, stem: str) -> None:
+        # Start the next input waiting for this output stem, if any
+        with self._lock:
+            waiting = self._waiting.get(stem)
+            if not waiting:
+                self._running.pop(stem, None)
+                return
+            key = next(iter(waiting))
+            del waiting[key]
+            if not waiting:
+                del self._waiting[stem]
+            self._running[stem] = key
+
+        self._submit(stem, key)
 
+    def _replace_executor(self, broken: Executor) -> Executor:
+        """Swaps a broken pool for a new one (once, however many futures report it)."""
+        with self._lock:
+            if self.executor is broken and self.executor_factory is not None:
+                self.executor = self.executor_factory()
+                logger.warning("worker pool broke; started a new one")
+            current = self.executor
+        if current is not broken:
+            broken.shutdown(wait=False)
+        return current
 
-def watch(input_dir: str, output_dir: str, *, stable_checks: int, stable_interval_ms: int) -> None:
+
+def watch(
+    input_dir: str,
+    output_dir: str,
+    *,
+    stable_checks: int,
+    stable_interval_ms: int,
+    workers: Optional[int] = None,
+) -> None:
     cfg = WatchConfig(
         input_dir=input_dir,
         output_dir=output_dir,
         stable_checks=stable_checks,
         stable_interval_ms=stable_interval_ms,
+        workers=workers,
     )
 
-    handler = _Handler(cfg)
+    new_pool = functools.partial(_process_pool, cfg.workers)
     observer = Observer()
+    handler = _Handler(
+        cfg,
+        new_pool(),
+        close_events=_emits_close_events(observer),
+        executor_factory=new_pool,
+    )
     observer.schedule(handler, input_dir, recursive=False)
     observer.start()
 
@@ -111,3 +296,4 @@ def watch(input_dir: str, output_dir: str, *, stable_checks: int, stable_interva
     except KeyboardInterrupt:
         observer.stop()
     observer.join()
+    handler.executor.shutdown(wait=True)
@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+
+from sketch2cad.contours import filter_contours, split_outer_holes_masks
+
+
+def _ring_with_speck() -> np.ndarray:
+    img = np.zeros((120, 120), dtype=np.uint8)
+    cv2.rectangle(img, (10, 10), (100, 100), 255, thickness=6)
+    img[110:113, 110:113] = 255  # 9 px speck
+    return img
+
+
+def test_filter_contours_removes_small_blobs():
+    img = _ring_with_speck()
+    cleaned = filter_contours(img, min_area=50)
+    assert cleaned.dtype == np.uint8
+    assert cleaned[111, 111] == 0
+    assert cleaned[10, 50] == 255
+
+
+def test_filter_contours_min_area_zero_keeps_input():
+    img = _ring_with_speck()
+    assert np.array_equal(filter_contours(img, min_area=0), img)
+
+
+def test_filter_contours_keeps_holes_and_thin_strokes():
+    img = _ring_with_speck()
+    cv2.line(img, (10, 115), (100, 115), 255, thickness=1)  # 91 px, no enclosed area
+    cleaned = filter_contours(img, min_area=50)
+    # area is the pixel count of the ink component, not its outline polygon
+    assert cleaned[115, 50] == 255
+    # the ring's interior is not ink and stays empty
+    assert cleaned[55, 55] == 0
+
+
+def test_split_outer_holes_masks_separates_hole():
+    img = _ring_with_speck()
+    outer, holes = split_outer_holes_masks(img, min_area=120)
+    # outer contour is filled, including the ring interior
+    assert outer[55, 55] == 255
+    assert outer[111, 111] == 0
+    # the ring interior is reported as a hole
+    assert holes[55, 55] == 255
+    assert holes[10, 50] == 0
+
+
+def test_split_outer_holes_masks_nested_island():
+    img = np.zeros((200, 200), dtype=np.uint8)
+    cv2.rectangle(img, (10, 10), (190, 190), 255, thickness=6)  # outer ring
+    cv2.rectangle(img, (60, 60), (140, 140), 255, thickness=6)  # island ring inside its hole
+    outer, holes = split_outer_holes_masks(img, min_area=120)
+    # nested contours must not punch holes into the filled masks
+    assert outer[100, 100] == 255
+    assert outer[35, 35] == 255
+    assert holes[100, 100] == 255
+    assert holes[60, 100] == 255
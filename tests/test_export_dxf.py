@@ -1,6 +1,9 @@
 from pathlib import Path
 import ezdxf
+import numpy as np
+import pytest
 from sketch2cad.export_dxf import export_paths_to_dxf
+from sketch2cad.models import PathSegment, VectorPath
 
 
 def test_export_writes_dxf(tmp_path: Path):
@@ -11,3 +14,105 @@ def test_export_writes_dxf(tmp_path: Path):
     doc = ezdxf.readfile(str(out))
     assert doc is not None
 
+
+def test_export_dedups_boundary_points_and_scales(tmp_path: Path):
+    out = tmp_path / "out.dxf"
+    square = VectorPath(
+        segments=[
+            PathSegment(kind="line", pts=[(0.0, 0.0), (10.0, 0.0)]),
+            PathSegment(kind="line", pts=[(10.0, 0.0), (10.0, 10.0)]),
+            PathSegment(kind="line", pts=[(10.0, 10.0), (0.0, 10.0)]),
+        ],
+        is_closed=True,
+    )
+    curve = VectorPath(
+        segments=[
+            PathSegment(kind="cubic_bezier", pts=[(0.0, 0.0), (0.0, 5.0), (5.0, 5.0), (5.0, 0.0)]),
+            PathSegment(kind="line", pts=[(5.0, 0.0), (0.0, 0.0)]),
+        ],
+        layer="HOLES",
+    )
+    export_paths_to_dxf([square, curve], str(out), scale=2.0, bezier_samples=8)
+
+    entities = list(ezdxf.readfile(str(out)).modelspace())
+    assert [e.dxftype() for e in entities] == ["LWPOLYLINE", "SPLINE"]
+
+    pl, spl = entities
+    assert pl.closed
+    assert [tuple(p) for p in pl.get_points("xy")] == [(0, 0), (20, 0), (20, 20), (0, 20)]
+
+    assert spl.dxf.layer == "HOLES"
+    fit = [tuple(p[:2]) for p in spl.fit_points]
+    # 9 bezier samples + closing line end point (shared start point is not duplicated)
+    assert len(fit) == 10
+    assert fit[0] == pytest.approx((0.0, 0.0))
+    assert fit[8] == pytest.approx((10.0, 0.0))
+    assert fit[4] == pytest.approx((5.0, 7.5))
+
+
+def test_sampling_paths_match_bezier_formulas():
+    from sketch2cad import _export_kernels
+    from sketch2cad.export_dxf import _join_segment_points, _sample_segments
+
+    segments = [
+        PathSegment(kind="line", pts=[(0.0, 0.0), (4.0, 0.0)]),
+        PathSegment(kind="quad_bezier", pts=[(4.0, 0.0), (6.0, 3.0), (4.0, 6.0)]),
+        PathSegment(kind="cubic_bezier", pts=[(4.5, 6.0), (2.0, 8.0), (0.0, 4.0), (0.0, 0.0)]),
+        PathSegment(kind="cubic_bezier", pts=[(0.0, 0.0), (1.0, 1.0)]),  # malformed -> line
+    ]
+    t = np.linspace(0.0, 1.0, 7)[:, None]
+    q0, q1, q2 = segments[1].pts
+    quad = (1 - t) ** 2 * q0 + 2 * (1 - t) * t * q1 + t**2 * q2
+    c0, c1, c2, c3 = segments[2].pts
+    cubic = (1 - t) ** 3 * c0 + 3 * (1 - t) ** 2 * t * c1 + 3 * (1 - t) * t**2 * c2 + t**3 * c3
+    # The quad and the malformed line start where the previous segment ends; the
+    # cubic starts half a unit away from the quad's end, so its start point is kept
+    expected = np.concatenate([segments[0].pts, quad[1:], cubic, [(1.0, 1.0)]]) * 2.5
+
+    batched = _join_segment_points(_sample_segments(segments, samples=6)) * 2.5
+    assert batched.shape == expected.shape
+    assert np.allclose(batched, expected)
+
+    kinds, pts_flat, offsets = _export_kernels.flatten_segments(segments)
+    # Call the uncompiled loop, so the kernel logic is checked even when numba is absent
+    got = _export_kernels._sample_path(kinds, pts_flat, offsets, 6, 2.5, 1e-6)
+    assert got.shape == expected.shape
+    assert np.allclose(got, expected)
+
+
+def test_export_kernel_sizes_buffer_per_segment_kind():
+    from sketch2cad import _export_kernels
+
+    # Disconnected lines keep both end points each: two rows per line, whatever samples is
+    segments = [
+        PathSegment(kind="line", pts=[(float(i), 0.0), (float(i), 1.0)]) for i in range(0, 6, 2)
+    ]
+    kinds, pts_flat, offsets = _export_kernels.flatten_segments(segments)
+    got = _export_kernels._sample_path(kinds, pts_flat, offsets, 1, 1.0, 1e-6)
+    assert got.tolist() == [[0, 0], [0, 1], [2, 0], [2, 1], [4, 0], [4, 1]]
+    assert np.array_equal(_export_kernels.sample_path(kinds, pts_flat, offsets, 1, 1.0, 1e-6), got)
+
+
+def test_export_rejects_zero_bezier_samples(tmp_path: Path):
+    path = VectorPath(
+        segments=[PathSegment(kind="quad_bezier", pts=[(0.0, 0.0), (1.0, 1.0), (2.0, 0.0)])]
+    )
+    with pytest.raises(ValueError, match="bezier_samples"):
+        export_paths_to_dxf([path], str(tmp_path / "out.dxf"), scale=1.0, bezier_samples=0)
+
+
+def test_export_line_path_keeps_gaps(tmp_path: Path):
+    out = tmp_path / "out.dxf"
+    path = VectorPath(
+        segments=[
+            PathSegment(kind="line", pts=[(0.0, 0.0), (1.0, 0.0)]),
+            PathSegment(kind="line", pts=[(1.0, 0.0), (1.0, 1.0)]),
+            PathSegment(kind="line", pts=[(3.0, 3.0), (4.0, 3.0)]),  # not connected
+        ]
+    )
+    export_paths_to_dxf([path], str(out), scale=1.0)
+
+    (pl,) = list(ezdxf.readfile(str(out)).modelspace())
+    assert pl.dxftype() == "LWPOLYLINE"
+    assert not pl.closed
+    assert [tuple(p) for p in pl.get_points("xy")] == [(0, 0), (1, 0), (1, 1), (3, 3), (4, 3)]
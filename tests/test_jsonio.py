@@ -0,0 +1,26 @@
+import pytest
+
+from sketch2cad import _jsonio
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_loads_round_trip(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(_jsonio, "orjson", None)
+
+    obj = {
+        "name": "Maße",
+        "bbox": [0.0, -1.5, 1e16, 1e-7],
+        "count": 3,
+        "closed": True,
+        "layer": None,
+        "paths": [{"kind": "cubic_bezier", "pts": [[0.1, 0.2], [0.3, 0.4]]}],
+    }
+    data = _jsonio.dumps(obj)
+
+    assert isinstance(data, bytes)
+    assert "Maße".encode() in data
+    assert _jsonio.loads(data) == obj
+    assert _jsonio.loads(data.decode("utf-8")) == obj
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import ezdxf
+import pytest
+
+from sketch2cad.metrics import compute_dxf_metrics
+
+
+def test_metrics_counts_and_bbox(tmp_path: Path):
+    out = tmp_path / "m.dxf"
+    doc = ezdxf.new(dxfversion="R2018")
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (10, 0), (10, 5)], dxfattribs={"layer": "OUTLINE"})
+    msp.add_spline(fit_points=[(2, 1), (4, 8), (6, 3), (12, -1)], dxfattribs={"layer": "HOLES"})
+    doc.saveas(str(out))
+
+    m = compute_dxf_metrics(str(out))
+    assert m.num_entities == 2
+    assert m.entities_by_type == {"LWPOLYLINE": 1, "SPLINE": 1}
+    assert m.layers == {"OUTLINE": 1, "HOLES": 1}
+    assert m.bbox_mm == pytest.approx((0.0, -1.0, 12.0, 8.0))
+
+
+def test_metrics_empty_dxf(tmp_path: Path):
+    out = tmp_path / "empty.dxf"
+    ezdxf.new(dxfversion="R2018").saveas(str(out))
+
+    m = compute_dxf_metrics(str(out))
+    assert m.num_entities == 0
+    assert m.bbox_mm == (0.0, 0.0, 0.0, 0.0)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from sketch2cad.models import PathSegment, VectorPath
+
+
+def test_path_segment_equality_compares_points():
+    a = PathSegment(kind="line", pts=[(0.0, 0.0), (1.0, 2.0)])
+    b = PathSegment(kind="line", pts=np.array([[0.0, 0.0], [1.0, 2.0]]))
+
+    assert a == b
+    assert a != PathSegment(kind="line", pts=[(0.0, 0.0), (1.0, 3.0)])
+    assert a != PathSegment(kind="cubic_bezier", pts=[(0.0, 0.0), (1.0, 2.0)])
+    assert a != PathSegment(kind="line", pts=[(0.0, 0.0), (1.0, 2.0), (3.0, 4.0)])
+
+
+def test_vector_path_equality():
+    def make(layer: str = "OUTLINE") -> VectorPath:
+        return VectorPath(
+            segments=[
+                PathSegment(kind="line", pts=[(0.0, 0.0), (1.0, 0.0)]),
+                PathSegment(kind="quad_bezier", pts=[(1.0, 0.0), (2.0, 1.0), (0.0, 0.0)]),
+            ],
+            is_closed=True,
+            layer=layer,
+        )
+
+    assert make() == make()
+    assert make() != make(layer="HOLES")
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from sketch2cad import pipeline
+from sketch2cad.models import PipelineConfig
+
+
+def _make_image(path: Path) -> None:
+    img = np.full((120, 160, 3), 255, dtype=np.uint8)
+    cv2.rectangle(img, (20, 20), (140, 100), (0, 0, 0), thickness=4)
+    cv2.imwrite(str(path), img)
+
+
+def test_debug_level_controls_artifacts(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(pipeline, "vectorize_with_potrace", lambda mask, debug_svg_path=None: [])
+
+    inp = tmp_path / "in.png"
+    _make_image(inp)
+
+    for level, expected in [
+        (0, set()),
+        (1, {"binary.png"}),
+        (2, {"binary.png", "mask_outer.png", "mask_holes.png"}),
+    ]:
+        debug_dir = tmp_path / f"_debug{level}"
+        cfg = PipelineConfig(
+            input_path=str(inp),
+            output_dxf=str(tmp_path / "out.dxf"),
+            mm_per_px=0.5,
+            debug_level=level,
+            debug_dir=str(debug_dir),
+        )
+        assert pipeline.run_pipeline(cfg).status == "ok"
+        found = {p.name for p in debug_dir.iterdir()} if debug_dir.exists() else set()
+        assert found == expected
+
+
+def test_no_contours_filter_keeps_split_min_area(tmp_path: Path, monkeypatch):
+    masks = []
+
+    def fake_vectorize(mask, debug_svg_path=None):
+        masks.append(mask)
+        return []
+
+    monkeypatch.setattr(pipeline, "vectorize_with_potrace", fake_vectorize)
+
+    inp = tmp_path / "in.png"
+    _make_image(inp)
+    img = cv2.imread(str(inp))
+    img[105:111, 5:11] = 0  # 36 px speck, below both minimum areas
+    cv2.imwrite(str(inp), img)
+
+    for use_filter in (True, False):
+        masks.clear()
+        cfg = PipelineConfig(
+            input_path=str(inp),
+            output_dxf=str(tmp_path / "out.dxf"),
+            mm_per_px=0.5,
+            use_contours_filter=use_filter,
+        )
+        assert pipeline.run_pipeline(cfg).status == "ok"
+        outer, _holes = masks
+        assert outer[60, 80] == 255  # the rectangle, filled
+        assert not outer[100:116, 0:16].any()  # the speck never becomes an outline
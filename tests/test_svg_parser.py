@@ -0,0 +1,136 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from sketch2cad import vectorize_potrace
+from sketch2cad.vectorize_potrace import _to_pbm, svg_to_paths, vectorize_with_potrace
+
+# Potrace-style SVG: group transform flips y, path data uses relative commands
+POTRACE_SVG = """<?xml version="1.0" standalone="no"?>
+<svg version="1.0" xmlns="http://www.w3.org/2000/svg"
+ width="100.000000pt" height="80.000000pt" viewBox="0 0 100.000000 80.000000">
+<g transform="translate(0.000000,80.000000) scale(1.000000,-1.000000)"
+fill="#000000" stroke="none">
+<path d="M10 10 l20 0 0 20 -20 0z"/>
+<path d="M40 40 c0 5 5 5 10 0 l0 -5"/>
+</g>
+</svg>
+"""
+
+
+def _write(tmp_path: Path) -> Path:
+    svg = tmp_path / "potrace.svg"
+    svg.write_text(POTRACE_SVG, encoding="utf-8")
+    return svg
+
+
+def test_svg_to_paths_applies_group_transform(tmp_path: Path):
+    paths = svg_to_paths(_write(tmp_path))
+    assert len(paths) == 2
+
+    square, curve = paths
+    assert square.is_closed
+    assert [s.kind for s in square.segments] == ["line"] * 4
+    assert [tuple(p) for p in square.segments[0].pts] == [(10.0, 70.0), (30.0, 70.0)]
+    assert tuple(square.segments[-1].pts[-1]) == (10.0, 70.0)
+    assert square.coords.shape == (8, 2)
+
+    assert not curve.is_closed
+    assert [s.kind for s in curve.segments] == ["cubic_bezier", "line"]
+    assert [tuple(p) for p in curve.segments[0].pts] == [
+        (40.0, 40.0),
+        (40.0, 35.0),
+        (45.0, 35.0),
+        (50.0, 40.0),
+    ]
+    assert [tuple(p) for p in curve.segments[1].pts] == [(50.0, 40.0), (50.0, 45.0)]
+
+
+def test_svg_to_paths_accepts_bytes(tmp_path: Path):
+    from_bytes = svg_to_paths(POTRACE_SVG.encode("utf-8"))
+    from_file = svg_to_paths(_write(tmp_path))
+    assert len(from_bytes) == len(from_file)
+    np.testing.assert_array_equal(from_bytes[1].coords, from_file[1].coords)
+
+
+def test_svg_to_paths_origin_offset(tmp_path: Path):
+    paths = svg_to_paths(_write(tmp_path), origin=(5, 7))
+    assert tuple(paths[0].segments[0].pts[0]) == pytest.approx((15.0, 77.0))
+    assert tuple(paths[1].segments[0].pts[-1]) == pytest.approx((55.0, 47.0))
+
+
+def test_vectorize_crop_and_debug_svg_agree(tmp_path: Path, monkeypatch):
+    traced = []
+
+    def fake_potrace(bitmap: np.ndarray) -> bytes:
+        # One rectangle around the ink, in potrace's y-up coordinates of the bitmap traced
+        traced.append(bitmap.shape)
+        x, y, w, h = cv2.boundingRect(bitmap)
+        return POTRACE_SVG.replace("80.000000", "%d.000000" % bitmap.shape[0]).replace(
+            '<path d="M10 10 l20 0 0 20 -20 0z"/>\n<path d="M40 40 c0 5 5 5 10 0 l0 -5"/>',
+            '<path d="M%d %d l%d 0 0 %d %d 0z"/>' % (x, bitmap.shape[0] - y - h, w, h, -w),
+        ).encode("ascii")
+
+    monkeypatch.setattr(vectorize_potrace, "_run_potrace", fake_potrace)
+    binary = np.zeros((60, 90), dtype=np.uint8)
+    binary[20:30, 40:70] = 255
+
+    (cropped,) = vectorize_with_potrace(binary)
+    assert traced == [(10, 30)]
+
+    debug_svg = tmp_path / "potrace_outline.svg"
+    (full,) = vectorize_with_potrace(binary, debug_svg_path=str(debug_svg))
+    # The debug SVG is traced from the whole mask, in the debug PNGs' pixel grid
+    assert traced[1] == (60, 90)
+    assert 'd="M40 30 l30 0' in debug_svg.read_text(encoding="ascii")
+
+    np.testing.assert_array_equal(cropped.coords, full.coords)
+    assert tuple(full.segments[0].pts[0]) == (40.0, 30.0)
+
+
+def test_svg_to_paths_splits_subpaths(tmp_path: Path):
+    # Potrace writes a shape and its holes as subpaths of one <path>
+    svg = tmp_path / "potrace.svg"
+    svg.write_text(
+        POTRACE_SVG.replace(
+            '<path d="M10 10 l20 0 0 20 -20 0z"/>',
+            '<path d="M0 0 h20 v20 h-20z m5 5 v10 h10 v-10z"/>',
+        ),
+        encoding="utf-8",
+    )
+    paths = svg_to_paths(svg)
+    assert len(paths) == 3
+
+    outer, hole = paths[0], paths[1]
+    assert outer.is_closed and hole.is_closed
+    assert [s.kind for s in hole.segments] == ["line"] * 4
+    assert [tuple(p) for p in hole.segments[0].pts] == [(5.0, 75.0), (5.0, 65.0)]
+
+
+def test_pbm_marks_ink_black(tmp_path: Path):
+    binary = np.zeros((5, 11), dtype=np.uint8)
+    binary[1:4, 2:10] = 255
+
+    pbm = tmp_path / "input.pbm"
+    pbm.write_bytes(_to_pbm(binary))
+    img = cv2.imread(str(pbm), cv2.IMREAD_GRAYSCALE)
+    np.testing.assert_array_equal(img == 0, binary > 127)
+
+
+def test_affine_kernel_matches_numpy():
+    from sketch2cad import _svg_kernels
+
+    pts = np.array([[0.0, 0.0], [10.0, 20.0], [-3.5, 7.25]])
+    m = (2.0, -0.5, 0.25, -1.0, 7.0, 420.0)
+    # The loop body and the NumPy fallback must agree; apply_affine is whichever one is active
+    got = _svg_kernels._apply_affine(pts, *m)
+    assert np.allclose(got, _svg_kernels._apply_affine_numpy(pts, *m))
+    assert np.allclose(got, _svg_kernels.apply_affine(pts, *m))
+
+
+def test_svg_to_paths_without_group_transform():
+    svg = b'''<svg xmlns="http://www.w3.org/2000/svg"><path d="M1 2 L3 4"/></svg>'''
+    (path,) = svg_to_paths(svg)
+    np.testing.assert_array_equal(path.coords, [[1.0, 2.0], [3.0, 4.0]])
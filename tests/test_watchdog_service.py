@@ -0,0 +1,233 @@
+import logging
+import os
+import sys
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from watchdog.observers.polling import PollingObserver
+
+from sketch2cad import watchdog_service
+from sketch2cad.watchdog_service import (
+    WatchConfig,
+    _emits_close_events,
+    _Handler,
+    _is_file_stable,
+)
+
+
+class StubExecutor:
+    """Records submitted inputs; each job's future is completed by the test."""
+
+    def __init__(self, submit_error: Exception | None = None):
+        self.submitted: list[str] = []
+        self.futures: list[Future] = []
+        self.submit_error = submit_error
+        self.shut_down = False
+
+    def submit(self, fn, input_path, output_dir):
+        if self.submit_error is not None:
+            raise self.submit_error
+        fut = Future()
+        self.submitted.append(input_path)
+        self.futures.append(fut)
+        return fut
+
+    def shutdown(self, wait=True):
+        self.shut_down = True
+
+
+def _event(path: Path, dest: Path | None = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        is_directory=False, src_path=str(path), dest_path=str(dest) if dest else ""
+    )
+
+
+def _handler(tmp_path: Path, executor, **kwargs) -> _Handler:
+    cfg = WatchConfig(
+        input_dir=str(tmp_path), output_dir=str(tmp_path / "out"), stable_interval_ms=0
+    )
+    return _Handler(cfg, executor, **kwargs)
+
+
+def test_created_waits_for_close_unless_moved_in(tmp_path: Path, monkeypatch):
+    empty = tmp_path / "empty.png"
+    empty.touch()
+    full = tmp_path / "full.png"
+    full.write_bytes(b"png")
+    ex = StubExecutor()
+    h = _handler(tmp_path, ex, close_events=True)
+
+    def no_polling(*_args):
+        raise AssertionError("size polling on the observer thread")
+
+    monkeypatch.setattr(watchdog_service, "_is_file_stable", no_polling)
+
+    h.on_created(_event(empty))
+    h.on_created(_event(full))
+
+    assert ex.submitted == [str(full)]
+
+
+def test_close_events_only_with_inotify():
+    assert not _emits_close_events(PollingObserver())
+
+    if not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+    from watchdog.observers.inotify import InotifyObserver
+
+    assert _emits_close_events(InotifyObserver())
+
+
+def test_closed_submits(tmp_path: Path):
+    img = tmp_path / "a.jpg"
+    img.write_bytes(b"jpg")
+    ex = StubExecutor()
+    h = _handler(tmp_path, ex, close_events=True)
+
+    h.on_closed(_event(img))
+
+    assert ex.submitted == [str(img)]
+
+
+def test_moved_submits_destination(tmp_path: Path):
+    img = tmp_path / "a.png"
+    img.write_bytes(b"png")
+    ex = StubExecutor()
+    h = _handler(tmp_path, ex, close_events=True)
+
+    h.on_moved(_event(tmp_path / "a.png.part", dest=img))
+    h.on_moved(_event(img, dest=tmp_path / "a.txt"))
+
+    assert ex.submitted == [str(img)]
+
+
+def test_modified_only_without_close_events(tmp_path: Path):
+    img = tmp_path / "a.png"
+    img.write_bytes(b"png")
+
+    ex = StubExecutor()
+    _handler(tmp_path, ex, close_events=True).on_modified(_event(img))
+    assert ex.submitted == []
+
+    ex = StubExecutor()
+    _handler(tmp_path, ex, close_events=False).on_modified(_event(img))
+    assert ex.submitted == [str(img)]
+
+
+def test_unchanged_file_is_submitted_once(tmp_path: Path):
+    img = tmp_path / "a.png"
+    img.write_bytes(b"png")
+    ex = StubExecutor()
+    h = _handler(tmp_path, ex, close_events=True)
+
+    h.on_closed(_event(img))
+    ex.futures[0].set_result(None)
+    h.on_closed(_event(img))
+    assert ex.submitted == [str(img)]
+
+    img.write_bytes(b"png, edited")
+    os.utime(img, ns=(0, 10**9))
+    h.on_closed(_event(img))
+    assert ex.submitted == [str(img), str(img)]
+
+
+def test_file_not_stable_when_size_changes(tmp_path: Path, monkeypatch):
+    img = tmp_path / "a.png"
+    img.write_bytes(b"png")
+
+    def growing_sleep(_seconds):
+        with img.open("ab") as f:
+            f.write(b"x")
+
+    monkeypatch.setattr(watchdog_service.time, "sleep", growing_sleep)
+    assert not _is_file_stable(img, checks=3, interval_ms=0)
+
+    monkeypatch.setattr(watchdog_service.time, "sleep", lambda _seconds: None)
+    assert _is_file_stable(img, checks=3, interval_ms=0)
+    assert not _is_file_stable(tmp_path / "missing.png", checks=3, interval_ms=0)
+
+
+def test_inputs_sharing_an_output_stem_run_one_at_a_time(tmp_path: Path):
+    png = tmp_path / "a.png"
+    jpg = tmp_path / "a.jpg"
+    other = tmp_path / "b.png"
+    for p in (png, jpg, other):
+        p.write_bytes(b"img")
+    ex = StubExecutor()
+    h = _handler(tmp_path, ex, close_events=True)
+
+    h.on_closed(_event(png))
+    h.on_closed(_event(jpg))
+    h.on_closed(_event(other))
+    assert ex.submitted == [str(png), str(other)]
+
+    ex.futures[0].set_result(None)
+    assert ex.submitted == [str(png), str(other), str(jpg)]
+
+
+def test_rewrite_while_running_is_processed_again(tmp_path: Path):
+    img = tmp_path / "a.png"
+    img.write_bytes(b"png")
+    ex = StubExecutor()
+    h = _handler(tmp_path, ex, close_events=True)
+
+    h.on_closed(_event(img))
+    img.write_bytes(b"png, rewritten")
+    os.utime(img, ns=(0, 10**9))
+    h.on_closed(_event(img))
+    h.on_closed(_event(img))  # unchanged since the rewrite: queued once
+    assert ex.submitted == [str(img)]
+
+    ex.futures[0].set_result(None)
+    assert ex.submitted == [str(img), str(img)]
+
+    ex.futures[1].set_result(None)
+    assert ex.submitted == [str(img), str(img)]
+    assert h._running == {}
+
+
+def test_failed_submit_releases_input(tmp_path: Path):
+    img = tmp_path / "a.png"
+    img.write_bytes(b"png")
+    ex = StubExecutor(submit_error=RuntimeError("shut down"))
+    h = _handler(tmp_path, ex, close_events=True)
+
+    h.on_closed(_event(img))
+    assert h._running == {}
+
+    # Released, so the next change to the file is picked up
+    ex.submit_error = None
+    img.write_bytes(b"png, edited")
+    h.on_closed(_event(img))
+    assert ex.submitted == [str(img)]
+
+
+def test_failed_job_is_logged(tmp_path: Path, caplog):
+    img = tmp_path / "a.png"
+    img.write_bytes(b"png")
+    ex = StubExecutor()
+    h = _handler(tmp_path, ex, close_events=True)
+
+    h.on_closed(_event(img))
+    with caplog.at_level(logging.ERROR, logger="sketch2cad.watchdog_service"):
+        ex.futures[0].set_exception(ValueError("bad image"))
+
+    assert "bad image" in caplog.text
+    assert h._running == {}
+
+
+def test_broken_pool_is_replaced(tmp_path: Path):
+    img = tmp_path / "a.png"
+    img.write_bytes(b"png")
+    broken = StubExecutor(submit_error=BrokenProcessPool())
+    fresh = StubExecutor()
+    h = _handler(tmp_path, broken, close_events=True, executor_factory=lambda: fresh)
+
+    h.on_closed(_event(img))
+
+    assert h.executor is fresh
+    assert broken.shut_down
+    assert fresh.submitted == [str(img)]